@@ -1,3 +1,5 @@
+from typing import List
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -42,8 +44,9 @@ class Settings(BaseSettings):
     # DB Settings
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "crypto_asset_manager"
-    MONGODB_MAX_CONNECTIONS: int = 1
-    MONGODB_MIN_CONNECTIONS: int = 1
+    MONGODB_MAX_CONNECTIONS: int = 64
+    MONGODB_MIN_CONNECTIONS: int = 8
+    MONGODB_MAX_IDLE_TIME_MS: int = 60000
 
     # API Version
     API_VERSION: str = "v1"
@@ -55,6 +58,9 @@ class Settings(BaseSettings):
     # App settings
     DEBUG: bool = False
 
+    # CORS, 部署時請設定為前端實際的網域 (JSON 陣列)
+    CORS_ALLOW_ORIGINS: List[str] = ["*"]
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,10 +1,58 @@
 from decimal import Decimal
-from typing import Dict, List, Optional
-from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
+from pymongo import UpdateOne
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from app.database.base import MongoDBBase
+from app.database.base import MongoDBBase, now_ms
+
+
+_NO_ID = {"_id": 0}
+_SYMBOL_PROJECTION = {"_id": 0, "exchange": 1, "symbol": 1}
+
+# {exchange: {symbol: asset}} 形式的分組
+_GROUP_BY_EXCHANGE = [
+    {"$project": {"_id": 0}},
+    {
+        "$group": {
+            "_id": "$exchange",
+            "assets": {"$push": {"k": "$symbol", "v": "$$ROOT"}}
+        }
+    },
+    {"$project": {"assets": {"$arrayToObject": "$assets"}}}
+]
+
+# $toDecimal 是為了相容舊資料 (以字串儲存的數值), 對 Decimal128 欄位沒有影響
+_PORTFOLIO_TOTALS = [
+    {
+        "$group": {
+            "_id": None,
+            "total": {"$sum": {"$toDecimal": "$value_in_usdt"}},
+            "profit": {"$sum": {"$toDecimal": "$profit_usdt"}},
+            "initial": {
+                "$sum": {
+                    "$multiply": [
+                        {"$toDecimal": "$total"},
+                        {"$toDecimal": "$avg_price"}
+                    ]
+                }
+            }
+        }
+    },
+    {"$project": {"_id": 0}}
+]
+
+
+def _min_value_match(min_value: Decimal) -> Dict:
+    # 與 WalletService.get_assets 相同: 穩定幣不論價值都保留
+    return {
+        "$match": {
+            "$or": [
+                {"symbol": {"$in": ["USDT", "USDC"]}},
+                {"$expr": {"$gte": [{"$toDecimal": "$value_in_usdt"}, min_value]}}
+            ]
+        }
+    }
 
 
 class AssetDB(MongoDBBase):
@@ -12,42 +60,128 @@ class AssetDB(MongoDBBase):
         super().__init__(mongo_client, "asset")
         self.add_index([("exchange", 1), ("symbol", 1)], unique=True)
         self.add_index("update_time")
+        # 每次寫入完成後遞增, 讀取端用來判斷快取是否已過期
+        self.version = 0
 
-    async def get_all_assets(self) -> Optional[List[Dict]]:
+    async def get_all_assets(self, min_value: Optional[Decimal] = None) -> Optional[List[Dict]]:
+        query = None
+        if min_value is not None:
+            # $toDecimal 同樣是為了相容以字串儲存的舊資料
+            query = {"$expr": {"$gte": [{"$toDecimal": "$value_in_usdt"}, min_value]}}
         return await self.find_many(
-            projection={"_id": 0},
+            query=query,
+            projection=_NO_ID,
+        )
+
+    async def get_asset_symbols(self, min_value: Decimal) -> List[Dict]:
+        """
+        Get only exchange and symbol of assets worth at least min_value.
+        Not cached, so a lagging secondary only delays new symbols by one request.
+        """
+        return await self.find_many(
+            query={"$expr": {"$gte": [{"$toDecimal": "$value_in_usdt"}, min_value]}},
+            projection=_SYMBOL_PROJECTION,
+            secondary=True,
         )
     
+    async def get_assets_grouped(self, min_value: Decimal) -> Dict[str, Dict[str, Dict]]:
+        """
+        Get assets worth at least min_value, grouped server-side as
+        {exchange: {symbol: asset}}.
+        Reads the primary: /assets caches this under the update_time version
+        read from the primary, so both must see the same writes.
+        """
+        result = await self.aggregate([_min_value_match(min_value), *_GROUP_BY_EXCHANGE])
+
+        return {group["_id"]: group["assets"] for group in result}
+
+    async def aggregate_portfolio_value(self, min_value: Decimal) -> Optional[Dict]:
+        """
+        Get assets worth at least min_value grouped by exchange, together with
+        the summed value, profit and initial cost of all assets, in one query.
+        Same rules as WalletService.get_assets: stablecoins are always listed,
+        and the totals are not affected by min_value.
+
+        Returns:
+            Dict: {"exchanges": {exchange: {symbol: asset}}, "total", "profit", "initial"}
+            None if the query failed
+        """
+        result = await self.aggregate([
+            {
+                "$facet": {
+                    "exchanges": [_min_value_match(min_value), *_GROUP_BY_EXCHANGE],
+                    "totals": _PORTFOLIO_TOTALS
+                }
+            }
+        ])
+
+        # $facet 一定回傳一筆文件, 沒有結果代表查詢失敗
+        if not result:
+            return None
+
+        facet = result[0]
+        totals = facet["totals"][0] if facet["totals"] else {}
+        return {
+            "exchanges": {group["_id"]: group["assets"] for group in facet["exchanges"]},
+            "total": totals.get("total", Decimal("0")),
+            "profit": totals.get("profit", Decimal("0")),
+            "initial": totals.get("initial", Decimal("0")),
+        }
+    
     async def get_asset_by_time_diff(self, time_diff: int) -> Optional[Dict]:
-        current_time = int(datetime.now(timezone.utc).timestamp() * 1000)
-        return await self.find_one(
+        # 回傳最近一次更新的資產, update_time 可當作快取版本使用
+        current_time = now_ms()
+        assets = await self.find_many(
             query={"update_time": {"$gt": current_time - time_diff}},
-            projection={"_id": 0},
+            projection=_NO_ID,
+            sort=[("update_time", -1)],
+            limit=1,
         )
+
+        return assets[0] if assets else None
     
     async def update_asset(self, exchange: str, symbol: str, data: Dict) -> bool:
-        return await self.update_one(
-            query={
-                "exchange": exchange,
-                "symbol": symbol
-            },
-            update={
-                "$set": data
-            },
-            upsert=True,
-        )
+        try:
+            return await self.update_one(
+                query={
+                    "exchange": exchange,
+                    "symbol": symbol
+                },
+                update={
+                    "$set": data
+                },
+                upsert=True,
+            )
+        finally:
+            self.version += 1
+    
+    async def bulk_update_assets(self, items: List[Tuple[str, str, Dict]]) -> bool:
+        try:
+            return await self.bulk_upsert([
+                UpdateOne(
+                    {"exchange": exchange, "symbol": symbol},
+                    {"$set": data},
+                    upsert=True,
+                )
+                for exchange, symbol, data in items
+            ])
+        finally:
+            self.version += 1
     
     async def update_avg_price(self, exchange: str, symbol: str, avg_price: Decimal) -> bool:
-        return await self.update_one(
-            query={
-                "exchange": exchange,
-                "symbol": symbol
-            },
-            update={
-                "$set": {
-                    "avg_price": str(avg_price),
-                    "update_time": int(datetime.now(timezone.utc).timestamp() * 1000)
-                }
-            },
-            upsert=False
-        )
\ No newline at end of file
+        try:
+            return await self.update_one(
+                query={
+                    "exchange": exchange,
+                    "symbol": symbol
+                },
+                update={
+                    "$set": {
+                        "avg_price": avg_price,
+                        "update_time": now_ms()
+                    }
+                },
+                upsert=False
+            )
+        finally:
+            self.version += 1
\ No newline at end of file
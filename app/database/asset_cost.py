@@ -1,11 +1,11 @@
-import time
-
 from decimal import Decimal
 from typing import Dict, Optional
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from app.database.base import MongoDBBase
+from app.database.base import MongoDBBase, now_ms
+
+_NO_ID = {"_id": 0}
 
 class AssetCostDB(MongoDBBase):
     def __init__(self, mongo_client: AsyncIOMotorClient):
@@ -20,7 +20,8 @@ class AssetCostDB(MongoDBBase):
                 "exchange": exchange,
                 "symbol": symbol
             },
-            projection={"_id": 0},
+            projection=_NO_ID,
+            upsert=True,
         )
 
     async def update_asset_cost(
@@ -29,18 +30,19 @@ class AssetCostDB(MongoDBBase):
         symbol: str, 
         avg_price: Decimal,
         update_by: str
-    ) -> bool:
-        return await self.update_one(
+    ) -> Optional[Dict]:
+        return await self.update_and_return(
             query={
                 "exchange": exchange,
                 "symbol": symbol
             },
             update={
                 "$set": {
-                    "avg_price": str(avg_price),
-                    "update_time": int(time.time()),
+                    "avg_price": avg_price,
+                    "update_time": now_ms(),
                     "update_by": update_by
                 }
             },
+            projection=_NO_ID,
             upsert=True,
         )
\ No newline at end of file
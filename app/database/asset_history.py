@@ -1,9 +1,25 @@
 from typing import Dict, List, Optional
-from datetime import datetime, timezone
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from .base import MongoDBBase
+from .base import MongoDBBase, now_ms
+
+_NO_ID = {"_id": 0}
+
+DAY_MS = 86400000
+
+# (當日 00:00 UTC, 隔日 00:00 UTC), 同一天內直接回傳快取的值
+_DAY_CACHE = (0, 0)
+
+
+def _today_ms_bucket() -> int:
+    global _DAY_CACHE
+    current_time = now_ms()
+    start, end = _DAY_CACHE
+    if not start <= current_time < end:
+        start = current_time - current_time % DAY_MS
+        _DAY_CACHE = (start, start + DAY_MS)
+    return start
 
 
 class AssetHistoryDB(MongoDBBase):
@@ -13,9 +29,8 @@ class AssetHistoryDB(MongoDBBase):
         self.add_index("update_time")
 
     async def update_history(self, history: Dict) -> bool:
-        timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
-        timestamp = (timestamp // 86400000) * 86400000
-        
+        timestamp = _today_ms_bucket()
+
         return await self.update_one(
             query={
                 "timestamp": timestamp
@@ -28,7 +43,7 @@ class AssetHistoryDB(MongoDBBase):
 
     async def get_latest_snapshot(self) -> Optional[Dict]:
         snapshots = await self.find_many(
-            projection={"_id": 0},
+            projection=_NO_ID,
             sort=[("timestamp", -1)],
             limit=1
         )
@@ -39,10 +54,16 @@ class AssetHistoryDB(MongoDBBase):
         self, 
         start_time: int, 
         end_time: int,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
+        projection = _NO_ID
+        if fields:
+            projection = {**_NO_ID, **{field: 1 for field in fields}}
+
         return await self.find_many(
             query={"timestamp": {"$gte": start_time, "$lte": end_time}},
-            projection={"_id": 0},
+            projection=projection,
+            sort=[("timestamp", 1)],
             limit=limit
         )
\ No newline at end of file
@@ -1,30 +1,76 @@
+import time
+import logging
+from decimal import Decimal
 from typing import List, Dict, Optional
 
+from bson.decimal128 import Decimal128, create_decimal128_context
+from bson.codec_options import CodecOptions, TypeCodec, TypeRegistry
+from pymongo import IndexModel, ReadPreference, ReturnDocument, UpdateOne
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+_DB_NAME = settings.MONGODB_DB_NAME
+
+
+def now_ms() -> int:
+    """Current UTC epoch time in milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+_DECIMAL128_CONTEXT = create_decimal128_context()
+
+
+class DecimalCodec(TypeCodec):
+    """Store Decimal as BSON Decimal128 and read it back as Decimal."""
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> Decimal128:
+        # Decimal128 最多 34 位有效數字, 由 float 轉來或相乘後的值需先捨入, 否則會拋出 Inexact
+        return Decimal128(_DECIMAL128_CONTEXT.create_decimal(value))
+
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+
+CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([DecimalCodec()]))
+
 
 class MongoDBBase:
     def __init__(self, mongo_client: AsyncIOMotorClient, collection_name: str):
         self.client = mongo_client
-        self.db = self.client[settings.MONGODB_DB_NAME]
+        self.db = self.client.get_database(_DB_NAME, codec_options=CODEC_OPTIONS)
         self.collection: AsyncIOMotorCollection = self.db[collection_name]
-        self._indexes = []
-
-    def add_index(self, keys, unique=False):
-        self._indexes.append((keys, unique))
+        self.secondary_collection: AsyncIOMotorCollection = self.collection.with_options(
+            read_preference=ReadPreference.SECONDARY_PREFERRED
+        )
+        self._indexes: List[IndexModel] = []
+
+    def add_index(self, keys, unique=False, **options):
+        """
+        Register an index to be created by create_indexes.
+
+        Args:
+            keys: Field name or list of (field, direction) tuples
+            unique: Whether the index enforces uniqueness
+            options: Extra index options passed to IndexModel
+                (e.g. partialFilterExpression, expireAfterSeconds)
+        """
+        self._indexes.append(IndexModel(keys, unique=unique, **options))
 
     async def create_indexes(self):
-        for keys, unique in self._indexes:
-            await self.collection.create_index(keys, unique=unique)
+        if self._indexes:
+            await self.collection.create_indexes(self._indexes)
 
     async def insert_one(self, document: Dict) -> Optional[str]:
         try:
             result = await self.collection.insert_one(document)
             return str(result.inserted_id) if result.inserted_id else None
-        except Exception as e:
-            print(f"Error inserting document: {e}")
+        except Exception:
+            logger.exception("Error inserting document")
             return None
 
     async def insert_many(self, documents: List[Dict]) -> bool:
@@ -33,8 +79,8 @@ class MongoDBBase:
                 result = await self.collection.insert_many(documents)
                 return bool(result.inserted_ids)
             return False
-        except Exception as e:
-            print(f"Error inserting documents: {e}")
+        except Exception:
+            logger.exception("Error inserting documents")
             return False
 
     async def find_one(
@@ -42,8 +88,8 @@ class MongoDBBase:
     ) -> Optional[Dict]:
         try:
             return await self.collection.find_one(query, projection)
-        except Exception as e:
-            print(f"Error finding document: {e}")
+        except Exception:
+            logger.exception("Error finding document")
             return None
 
     async def find_many(
@@ -52,61 +98,93 @@ class MongoDBBase:
         projection: Dict = None,
         sort: List[tuple] = None,
         limit: int = None,
+        secondary: bool = False,
     ) -> List[Dict]:
         try:
-            cursor = self.collection.find(query, projection)
+            collection = self.secondary_collection if secondary else self.collection
+            cursor = collection.find(query, projection)
             if sort:
                 cursor = cursor.sort(sort)
             if limit:
                 cursor = cursor.limit(limit)
+                return await cursor.to_list(length=limit)
             return await cursor.to_list(None)
-        except Exception as e:
-            print(f"Error finding documents: {e}")
+        except Exception:
+            logger.exception("Error finding documents")
             return []
 
     async def update_one(self, query: Dict, update: Dict, upsert: bool = False) -> bool:
         try:
             result = await self.collection.update_one(query, update, upsert=upsert)
-            return result.modified_count > 0 or (upsert and result.upserted_id)
-        except Exception as e:
-            print(f"Error updating document: {e}")
+            return (
+                result.upserted_id is not None
+                or result.matched_count > 0
+            )
+        except Exception:
+            logger.exception("Error updating document")
             return False
 
+    async def update_and_return(
+        self, query: Dict, update: Dict, projection: Dict = None, upsert: bool = False
+    ) -> Optional[Dict]:
+        try:
+            return await self.collection.find_one_and_update(
+                query,
+                update,
+                projection=projection,
+                upsert=upsert,
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception:
+            logger.exception("Error updating and returning document")
+            return None
+
     async def update_many(self, query: Dict, update: Dict, upsert: bool = False) -> int:
         try:
             result = await self.collection.update_many(query, update, upsert=upsert)
             return result.modified_count
-        except Exception as e:
-            print(f"Error updating documents: {e}")
+        except Exception:
+            logger.exception("Error updating documents")
+            return False
+
+    async def bulk_upsert(self, operations: List[UpdateOne]) -> bool:
+        try:
+            if operations:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                return result.acknowledged
+            return False
+        except Exception:
+            logger.exception("Error bulk writing documents")
             return False
 
     async def delete_one(self, query: Dict) -> bool:
         try:
             result = await self.collection.delete_one(query)
             return result.deleted_count > 0
-        except Exception as e:
-            print(f"Error deleting document: {e}")
+        except Exception:
+            logger.exception("Error deleting document")
             return False
 
     async def delete_many(self, query: Dict) -> int:
         try:
             result = await self.collection.delete_many(query)
             return result.deleted_count
-        except Exception as e:
-            print(f"Error deleting documents: {e}")
+        except Exception:
+            logger.exception("Error deleting documents")
             return False
 
     async def count_documents(self, query: Dict) -> int:
         try:
             return await self.collection.count_documents(query)
-        except Exception as e:
-            print(f"Error counting documents: {e}")
+        except Exception:
+            logger.exception("Error counting documents")
             return 0
 
-    async def aggregate(self, pipeline: List[Dict]) -> List[Dict]:
+    async def aggregate(self, pipeline: List[Dict], secondary: bool = False) -> List[Dict]:
         try:
-            cursor = self.collection.aggregate(pipeline)
+            collection = self.secondary_collection if secondary else self.collection
+            cursor = collection.aggregate(pipeline)
             return await cursor.to_list(None)
-        except Exception as e:
-            print(f"Error aggregating documents: {e}")
+        except Exception:
+            logger.exception("Error aggregating documents")
             return []
@@ -1,8 +1,23 @@
-from datetime import datetime
-from typing import Dict, Optional
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from app.database.base import MongoDBBase
+from app.database.base import MongoDBBase, now_ms
+
+logger = logging.getLogger(__name__)
+
+_CHART_META_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "name": 1,
+    "symbol": 1,
+    "timestamp": 1,
+    "resolution": 1
+}
+_CHART_PROJECTION = {**_CHART_META_PROJECTION, "content": 1}
 
 
 class ChartStorageDB(MongoDBBase):
@@ -10,16 +25,32 @@ class ChartStorageDB(MongoDBBase):
         super().__init__(mongo_client, "charts_storage")
         self.add_index("id")
         self.add_index("name")
-        self.add_index("timestamp")
+        self.add_index([
+            ("timestamp", -1), ("name", 1), ("symbol", 1), ("resolution", 1), ("id", 1)
+        ])
 
-    async def get_next_sequence_value(self) -> int:
+        # 一次向 counters 預領一段序號, 用完才再去資料庫拿
+        self._seq_lock = asyncio.Lock()
+        self._seq_lo = 1
+        self._seq_hi = 0
+
+    async def _alloc_seq(self, block: int = 100) -> None:
         result = await self.db.counters.find_one_and_update(
             {"_id": "chart_sequence"},
-            {"$inc": {"sequence_value": 1}},
+            {"$inc": {"sequence_value": block}},
             upsert=True,
-            return_document=True
+            return_document=ReturnDocument.AFTER
         )
-        return result["sequence_value"]
+        self._seq_hi = result["sequence_value"]
+        self._seq_lo = self._seq_hi - block + 1
+
+    async def get_next_sequence_value(self) -> int:
+        async with self._seq_lock:
+            if self._seq_lo > self._seq_hi:
+                await self._alloc_seq()
+            value = self._seq_lo
+            self._seq_lo += 1
+            return value
 
     async def save_chart(
         self,
@@ -31,7 +62,7 @@ class ChartStorageDB(MongoDBBase):
     ) -> bool:
         try:
             if timestamp is None:
-                timestamp = int(datetime.now().timestamp() * 1000)
+                timestamp = now_ms()
 
             id = await self.get_next_sequence_value()
 
@@ -46,26 +77,18 @@ class ChartStorageDB(MongoDBBase):
                         "symbol": symbol,
                         "resolution": resolution,
                         "timestamp": timestamp,
-                        "update_time": datetime.now()
+                        "update_time": now_ms()
                     }
                 },
                 upsert=True
             )
-        except Exception as e:
-            print(f"Error saving chart: {e}")
+        except Exception:
+            logger.exception("Error saving chart")
             return False
         
     async def get_latest_chart(self) -> Optional[Dict]:
         charts = await self.find_many(
-            projection={
-                "_id": 0,
-                "id": 1,
-                "name": 1,
-                "content": 1,
-                "symbol": 1,
-                "timestamp": 1,
-                "resolution": 1
-            },
+            projection=_CHART_PROJECTION,
             sort=[("timestamp", -1)],
             limit=1
         )
@@ -81,29 +104,17 @@ class ChartStorageDB(MongoDBBase):
             query={
                 "id": id
             },
-            projection={
-                "_id": 0,
-                "id": 1,
-                "name": 1,
-                "content": 1,
-                "symbol": 1,
-                "timestamp": 1,
-                "resolution": 1
-            }
+            projection=_CHART_PROJECTION
         )
 
-    async def get_all_charts(self) -> Optional[Dict]:
+    async def list_charts(self) -> List[Dict]:
+        # 不經過 find_many: 查詢失敗要拋出例外, 呼叫端才不會把空 list 當成結果快取
+        cursor = self.collection.find({}, _CHART_META_PROJECTION).sort([("timestamp", -1)])
+        return await cursor.to_list(None)
 
+    async def get_all_charts(self) -> List[Dict]:
         return await self.find_many(
-            projection={
-                "_id": 0,
-                "id": 1,
-                "name": 1,
-                "content": 1,
-                "symbol": 1,
-                "timestamp": 1,
-                "resolution": 1
-            },
+            projection=_CHART_PROJECTION,
             sort=[("timestamp", -1)]
         )
 
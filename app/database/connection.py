@@ -1,7 +1,15 @@
+import logging
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 資料庫中斷時盡快失敗, 不讓請求卡在預設的 30 秒選擇逾時
+SERVER_SELECTION_TIMEOUT_MS = 5000
+SOCKET_TIMEOUT_MS = 45000
+
 
 class MongoDB:
     client: AsyncIOMotorClient = None
@@ -20,13 +28,19 @@ class MongoDB:
                 settings.MONGODB_URI,
                 maxPoolSize=settings.MONGODB_MAX_CONNECTIONS,
                 minPoolSize=settings.MONGODB_MIN_CONNECTIONS,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=5000,
+                serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=SOCKET_TIMEOUT_MS,
+                retryWrites=True,
+                appname="crypto_asset_manager",
             )
             await cls.client.admin.command("ping")
-            print("Connected to MongoDB")
+            logger.info("Connected to MongoDB")
 
     @classmethod
     async def close(cls):
         if cls.client is not None:
-            await cls.client.close()
+            cls.client.close()
             cls.client = None
-            print("Closed MongoDB connection")
+            logger.info("Closed MongoDB connection")
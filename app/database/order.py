@@ -9,7 +9,9 @@ from app.structures.order_structure import Order
 class OrderDB(MongoDBBase):
     def __init__(self, mongo_client: AsyncIOMotorClient):
         super().__init__(mongo_client, "orders")
-        self.add_index([("exchange", 1), ("symbol", 1)])
+        self.add_index([("exchange", 1), ("symbol", 1), ("status", 1), ("timestamp", -1)])
+        # 只依 status 查詢時 (例如所有交易所的未成交訂單) 無法使用上面的複合索引
+        self.add_index([("status", 1), ("timestamp", -1)])
         self.add_index([("timestamp", -1)])
         self.add_index([("order_id", 1)], unique=True)
 
@@ -1,76 +1,311 @@
 import os
-import json
+import hashlib
+import logging
+import time
+import asyncio
 from decimal import Decimal
 from contextlib import asynccontextmanager
-from typing import Optional
-from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from datetime import datetime, timezone
 
+import orjson
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
 from app.config import settings
+from app.logging_config import setup_logging
 from app.database.connection import MongoDB
+from app.database.asset_history import DAY_MS
+from app.database.base import now_ms
 from app.services.service_manager import ServiceManager
 from app.structures.response_structure import BaseResponse, BaseDataResponse
 from app.structures.request_structure import (
-    AssetCostUpdate, ExchangeSettingsUpdate, ChartSaveRequest, 
+    AssetCostUpdate, ExchangeSettingsUpdate, ChartSaveRequest, HistoryPeriod,
     OpenOrderRequest, CancelOrderRequest, TransferRequest
 )
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # 快取週期
 CACHE_TTL = 60000
 
+# 交易對清單不列出的穩定幣
+_QUOTE_STABLECOINS = frozenset({"USDT", "USDC"})
+
+# min_value -> (最新資產 update_time, 讀取時的 AssetDB.version, 序列化後的回應內容)
+# 在 update_time 超過 CACHE_TTL 前直接回傳, 不再查詢 MongoDB; 資產有寫入 (version 改變) 即失效
+_assets_payload_cache: Dict[Decimal, Tuple[int, int, bytes]] = {}
+
+# 進行中的資產刷新, 以 min_value 為 key
+_assets_refreshes: Dict[Decimal, asyncio.Future] = {}
+
+# 短期結果快取: key -> (到期時間 monotonic 秒, 結果 future)
+_ttl_cache: Dict[Hashable, Tuple[float, asyncio.Future]] = {}
+
+# 最後一次成功的結果, 上游失敗時作為備援 (僅限 stale_ok 的 key)
+_last_good: Dict[Hashable, Any] = {}
+
+# 限制同時對所有交易所扇出的請求數量 (資產刷新 / 重新初始化交易所)
+EXCHANGE_FANOUT_LIMIT = 4
+_exchange_fanout = asyncio.Semaphore(EXCHANGE_FANOUT_LIMIT)
+
+# 進行中的交易所重新初始化, 同時間的請求共用同一次
+_exchanges_init: Optional[asyncio.Future] = None
+
+# 不同的 API 設定無法合併, 改為依序套用, 避免同時改寫 exchanges
+_exchange_settings_lock = asyncio.Lock()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
+def _json_response(
+    content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize content with orjson and return it as-is, skipping FastAPI's
+    response model validation. Decimals are rendered as strings like the models do.
+    """
+    return Response(
+        content=orjson.dumps(content, default=str),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _encode_with_etag(content: Any) -> Tuple[str, bytes]:
+    """Serialize content with orjson and derive a strong ETag from the bytes."""
+    payload = orjson.dumps(content, default=str)
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"', payload
+
+
+def _conditional_response(
+    request: Request, etag: str, payload: bytes, cache_control: str
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+async def _cached(
+    key: Tuple,
+    ttl: float,
+    factory: Callable[[], Awaitable[Any]],
+    stale_ok: bool = False,
+) -> Any:
+    """
+    Return the result of factory() cached for ttl seconds. Concurrent callers
+    share one in-flight call; failures and empty results are not cached.
+    With stale_ok, a failed refresh falls back to the last successful result.
+    """
+    now = time.monotonic()
+    entry = _ttl_cache.get(key)
+    if entry is None or entry[0] <= now:
+        for expired in [k for k, (expires, _) in _ttl_cache.items() if expires <= now]:
+            del _ttl_cache[expired]
+
+        future = asyncio.ensure_future(factory())
+        entry = (now + ttl, future)
+        _ttl_cache[key] = entry
+
+        def _on_done(done: asyncio.Future) -> None:
+            if done.cancelled() or done.exception() is not None or not done.result():
+                if _ttl_cache.get(key) is entry:
+                    del _ttl_cache[key]
+            elif stale_ok:
+                _last_good[key] = done.result()
+
+        future.add_done_callback(_on_done)
+
+    try:
+        result = await asyncio.shield(entry[1])
+    except Exception:
+        if stale_ok and key in _last_good:
+            logger.warning("Serving stale result for %s", key, exc_info=True)
+            return _last_good[key]
+        raise
+
+    if not result and stale_ok and key in _last_good:
+        logger.warning("Serving stale result for %s", key)
+        return _last_good[key]
+    return result
+
+
+def _invalidate_cached(group: str) -> None:
+    """Drop every cached result whose key starts with group."""
+    for key in [k for k in _ttl_cache if k[0] == group]:
+        del _ttl_cache[key]
+
+
+async def _initialize_exchanges(base_exchange) -> None:
+    async with _exchange_fanout:
+        await base_exchange.initialize_exchanges_by_server()
+    _invalidate_cached("networks")
+
+
+async def _refresh_assets(wallet_service, min_value: Decimal) -> Dict:
+    async with _exchange_fanout:
+        return await wallet_service.get_assets(min_value)
+
+
+def _load_symbol_mapping() -> Dict[str, Any]:
+    """Locate and parse symbol_exchange_mapping.json once; empty mapping if missing."""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    possible_paths = [
+        os.path.join(app_dir, "symbol_exchange_mapping.json"),
+        os.path.join(os.path.dirname(os.path.dirname(app_dir)),
+                     "CryptoAssetsManager",
+                     "symbol_exchange_mapping.json"),
+        os.path.join(os.path.dirname(app_dir), "symbol_exchange_mapping.json"),
+    ]
+
+    for path in possible_paths:
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    return orjson.loads(f.read())
+            except Exception:
+                logger.exception("Error loading symbol mapping from %s", path)
+                return {}
+
+    logger.warning("Symbol mapping file not found")
+    return {}
+
+
+def _bind_services(app: FastAPI) -> None:
+    """
+    Resolve services once and bind them to app.state for the routes.
+    Each binding is independent: when MongoDB is unavailable only the
+    database-backed services are missing, as with the lazy getters.
+    """
+    app.state.symbol_mapping = _load_symbol_mapping()
+
+    # 服務在啟動時解析一次, 路由直接從 app.state 取用
+    for name, getter in (
+        ("asset_db", ServiceManager.get_asset_db),
+        ("order_db", ServiceManager.get_order_db),
+        ("transaction_db", ServiceManager.get_transaction_db),
+        ("asset_cost_db", ServiceManager.get_asset_cost_db),
+        ("asset_history_db", ServiceManager.get_asset_history_db),
+        ("chart_storage_db", ServiceManager.get_chart_storage_db),
+        ("base_exchange", ServiceManager.get_base_exchange),
+        ("quote_service", ServiceManager.get_quote_service),
+        ("wallet_service", ServiceManager.get_wallet_service),
+        ("trading_service", ServiceManager.get_trading_service),
+        ("transfer_service", ServiceManager.get_transfer_service),
+        ("asset_history_service", ServiceManager.get_asset_history_service),
+        ("websocket_service", ServiceManager.get_websocket_service),
+    ):
+        try:
+            setattr(app.state, name, getter())
+        except Exception:
+            logger.exception("Failed to resolve %s", name)
+
+
+async def update_daily_assets():
+    try:
+        # 純整數運算: 今天 UTC 零點往前一天
+        today_timestamp = now_ms() // DAY_MS * DAY_MS
+        yesterday_timestamp = today_timestamp - DAY_MS
+        yesterday = datetime.fromtimestamp(yesterday_timestamp // 1000, timezone.utc)
+
+        asset_history_service = app.state.asset_history_service
+        success = await asset_history_service.update_daily_snapshot(timestamp=yesterday_timestamp)
+
+        if success:
+            logger.info("Successfully updated asset history for %s", yesterday.date())
+        else:
+            logger.warning("Failed to update asset history for %s", yesterday.date())
+    except Exception:
+        logger.exception("Error in daily asset update")
+
+
+async def _catch_up_daily_snapshot():
+    """Run the daily update now if the 00:00 UTC run was missed while the app was down."""
+    try:
+        # 每日工作會寫入今天的 bucket, 已有今天的快照代表不需要補跑
+        latest = await app.state.asset_history_db.get_latest_snapshot()
+        if latest is None or latest["timestamp"] < now_ms() // DAY_MS * DAY_MS:
+            await update_daily_assets()
+    except Exception:
+        logger.exception("Error catching up daily asset update")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for handling startup and shutdown events.
     Initializes exchanges when the application starts.
     """
+    # 錯過的觸發合併為一次執行, 避免重複抓取所有交易所
+    scheduler = AsyncIOScheduler(
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 3600}
+    )
+    catch_up: Optional[asyncio.Task] = None
+
+    services_ready = False
     try:
         # Startup
+        logger.info("Running on %s event loop", type(asyncio.get_running_loop()).__module__)
         await MongoDB.connect()
         await ServiceManager.initialize_services()
+        services_ready = True
+    except Exception:
+        logger.exception("Failed to initialize exchanges")
 
-        scheduler = AsyncIOScheduler()
+    # 不論 MongoDB 是否成功都要綁定, 只需要交易所的路由仍可使用
+    _bind_services(app)
 
-        async def update_daily_assets():
-            try:
-                yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-                yesterday_timestamp = int(yesterday.timestamp() * 1000)
-                yesterday_timestamp = (yesterday_timestamp // 86400000) * 86400000
-                
-                asset_history_service = ServiceManager.get_asset_history_service()
-                success = await asset_history_service.update_daily_snapshot(timestamp=yesterday_timestamp)
-                
-                if success:
-                    print(f"Successfully updated asset history for {yesterday.date()}")
-                else:
-                    print(f"Failed to update asset history for {yesterday.date()}")
-            except Exception as e:
-                print(f"Error in daily asset update: {e}")
-
-        scheduler.add_job(update_daily_assets, "cron", hour=0, minute=0, timezone="UTC")
-
-        scheduler.add_listener(
-            lambda event: print(
-                f"Job executed: {event.job_id}, executed at {event.scheduled_run_time}"
-            ),
-            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR,
-        )
+    # 排程需要資料庫與交易所, 啟動失敗時不啟動
+    if services_ready:
+        try:
+            scheduler.add_listener(
+                lambda event: logger.info(
+                    "Job executed: %s, executed at %s", event.job_id, event.scheduled_run_time
+                ),
+                EVENT_JOB_EXECUTED | EVENT_JOB_ERROR,
+            )
 
-        scheduler.start()
-        print("Daily asset update scheduler started")
+            scheduler.add_job(
+                update_daily_assets,
+                "cron",
+                hour=0,
+                minute=0,
+                timezone="UTC",
+                id="daily_snapshot",
+            )
+            scheduler.start()
 
-    except Exception as e:
-        print(f"Failed to initialize exchanges: {str(e)}")
+            # 排程只存在記憶體, 停機期間錯過的執行改由啟動時檢查補跑; 在背景執行, 不延遲啟動
+            catch_up = asyncio.create_task(_catch_up_daily_snapshot())
+            logger.info("Daily asset update scheduler started")
+        except Exception:
+            logger.exception("Failed to start daily asset update scheduler")
 
     yield
 
     # Shutdown
-    scheduler.shutdown()
+    # 啟動失敗時排程器不會啟動, 只關閉實際啟動過的資源
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    if catch_up is not None and not catch_up.done():
+        catch_up.cancel()
     await ServiceManager.cleanup_services()
+    await MongoDB.close()
 
 
 app = FastAPI(
@@ -80,19 +315,25 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 資產 / 歷史 / 交易對清單的 JSON 重複度高, 超過 1KB 才壓縮; 304 沒有內容不受影響
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    max_age=86400,
 )
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+router = APIRouter(prefix=settings.API_PREFIX)
 
-@app.post(f"{settings.API_PREFIX}/exchanges/settings")
-async def update_exchange_settings(data: ExchangeSettingsUpdate) -> BaseResponse:
+
+@router.post("/exchanges/settings")
+async def update_exchange_settings(request: Request, data: ExchangeSettingsUpdate) -> BaseResponse:
     """
     Set API keys and secrets for exchanges.
     Parameters:
@@ -102,7 +343,7 @@ async def update_exchange_settings(data: ExchangeSettingsUpdate) -> BaseResponse
         BaseResponse(status, message)
     """
     try:
-        base_exchange = ServiceManager.get_base_exchange()
+        base_exchange = request.app.state.base_exchange
 
         apis = {
             exchange: {
@@ -113,9 +354,10 @@ async def update_exchange_settings(data: ExchangeSettingsUpdate) -> BaseResponse
             if settings.api_key and settings.secret
         }
 
-        await base_exchange.initialize_exchanges(apis)
-
-        results = await base_exchange.ping_exchanges()
+        async with _exchange_settings_lock, _exchange_fanout:
+            await base_exchange.initialize_exchanges(apis)
+            _invalidate_cached("networks")
+            results = await base_exchange.ping_exchanges()
 
         if results:
             return BaseResponse(
@@ -140,16 +382,20 @@ async def update_exchange_settings(data: ExchangeSettingsUpdate) -> BaseResponse
         raise HTTPException(status_code=500, detail=f"Failed to set API keys: {str(e)}")
 
 
-@app.get(f"{settings.API_PREFIX}/exchanges/initialize")
-async def initialize_exchanges() -> BaseResponse:
+@router.get("/exchanges/initialize")
+async def initialize_exchanges(request: Request) -> BaseResponse:
     """
     Reinitialize all exchange connections.
     Returns:
         BaseResponse(status, message)
     """
     try:
-        base_exchange = ServiceManager.get_base_exchange()
-        await base_exchange.initialize_exchanges_by_server()
+        global _exchanges_init
+
+        base_exchange = request.app.state.base_exchange
+        if _exchanges_init is None or _exchanges_init.done():
+            _exchanges_init = asyncio.ensure_future(_initialize_exchanges(base_exchange))
+        await asyncio.shield(_exchanges_init)
         return BaseResponse(
             status="success", 
             message="Exchanges initialized successfully"
@@ -160,46 +406,39 @@ async def initialize_exchanges() -> BaseResponse:
         )
 
 
-@app.get(f"{settings.API_PREFIX}/exchanges/list")
-async def list_exchanges() -> BaseDataResponse:
+@router.get("/exchanges/list")
+async def list_exchanges(request: Request) -> BaseDataResponse:
     """
     List all available exchanges.
     Returns:
         Dict with exchange names and status
     """
     try:
-        base_exchange = ServiceManager.get_base_exchange()
-        exchanges = base_exchange.exchanges.keys()
-        return BaseDataResponse(
-            status="success",
-            data=exchanges
-        )
+        base_exchange = request.app.state.base_exchange
+        return _json_response({"status": "success", "data": list(base_exchange.exchanges)})
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to list exchanges: {str(e)}"
         )
 
 
-@app.get(f"{settings.API_PREFIX}/exchanges/status")
-async def ping_exchanges() -> BaseDataResponse:
+@router.get("/exchanges/status")
+async def ping_exchanges(request: Request) -> BaseDataResponse:
     """
     Quickly check connection status for all exchanges.
     """
     try:
-        base_exchange = ServiceManager.get_base_exchange()
+        base_exchange = request.app.state.base_exchange
         results = await base_exchange.ping_exchanges()
-        return BaseDataResponse(
-            status="success",
-            data=results
-        )
+        return _json_response({"status": "success", "data": results})
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to ping exchanges: {str(e)}"
         )
 
 
-@app.post(f"{settings.API_PREFIX}/assets/cost")
-async def update_asset_cost(data: AssetCostUpdate) -> BaseResponse:
+@router.post("/assets/cost")
+async def update_asset_cost(request: Request, data: AssetCostUpdate) -> BaseResponse:
     """
     Update asset cost for a specific exchange and symbol.
     
@@ -212,28 +451,38 @@ async def update_asset_cost(data: AssetCostUpdate) -> BaseResponse:
         BaseResponse(status, message)
     """
     try:
-        asset_cost_db = ServiceManager.get_asset_cost_db()
-        success = await asset_cost_db.update_asset_cost(
-            exchange=data.exchange,
-            symbol=data.symbol,
-            avg_price=Decimal(data.cost),
-            update_by="Client"
+        avg_price = data.cost
+        asset_cost_db = request.app.state.asset_cost_db
+        asset_db = request.app.state.asset_db
+
+        # 兩個 collection 的寫入互不相依, 同時送出
+        cost_updated, price_updated = await asyncio.gather(
+            asset_cost_db.update_asset_cost(
+                exchange=data.exchange,
+                symbol=data.symbol,
+                avg_price=avg_price,
+                update_by="Client"
+            ),
+            asset_db.update_avg_price(
+                exchange=data.exchange,
+                symbol=data.symbol,
+                avg_price=avg_price
+            ),
+            return_exceptions=True,
         )
 
-        if not success:
+        # 任一寫入拋出例外時仍等待另一個完成, 再視為失敗回報
+        for result in (cost_updated, price_updated):
+            if isinstance(result, Exception):
+                logger.error("Error updating asset cost", exc_info=result)
+
+        if not cost_updated or isinstance(cost_updated, Exception):
             raise HTTPException(
                 status_code=500,
                 detail="Failed to update asset cost"
             )
 
-        asset_db = ServiceManager.get_asset_db()
-        success = await asset_db.update_avg_price(
-            exchange=data.exchange,
-            symbol=data.symbol,
-            avg_price=Decimal(data.cost)
-        )
-        
-        if not success:
+        if not price_updated or isinstance(price_updated, Exception):
             raise HTTPException(
                 status_code=500,
                 detail="Failed to update asset cost in assets"
@@ -244,61 +493,64 @@ async def update_asset_cost(data: AssetCostUpdate) -> BaseResponse:
             message="Asset cost updated successfully"
         )
         
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid cost value"
-        )
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to update asset cost: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/assets/history")
+@router.get("/assets/history")
 async def get_asset_history(
-    period: int = Query(
-        default=30,
-        description="Time period for history in days (1-730)",
-        ge=1,
-        le=730,
+    request: Request,
+    period: HistoryPeriod = Query(
+        default=HistoryPeriod.DAYS_30,
+        description="Time period for history in days (30, 90, 180, 365)",
     ),
 ) -> BaseDataResponse:
     """
     Get asset history for specified time period.
 
     Parameters:
-        period: Time period for history in days (1-730)
+        period: Time period for history in days (30, 90, 180, 365)
 
     Returns:
         BaseDataResponse(status, data)
     """
     try:
-        asset_history_service = ServiceManager.get_asset_history_service()
-        history_data = await asset_history_service.get_asset_history(period)
+        asset_history_service = request.app.state.asset_history_service
+
+        async def build_payload() -> Optional[Tuple[str, bytes]]:
+            history_data = await asset_history_service.get_asset_history(period)
+            if not history_data:
+                return None
+            # 直接序列化成 bytes 快取, 不再保留 list 與 response model 兩份資料
+            return _encode_with_etag({"status": "success", "data": history_data})
+
+        # 歷史資料以天為單位, 同一天內同一個 period 的結果共用一小時
+        day_bucket = now_ms() // DAY_MS
+        cached = await _cached(("asset_history", period, day_bucket), 3600, build_payload)
 
-        if not history_data:
+        if not cached:
             return BaseDataResponse(
                 status="error",
                 data=[]
             )
 
-        return BaseDataResponse(
-            status="success",
-            data=history_data
-        )
+        etag, payload = cached
+        return _conditional_response(request, etag, payload, "public, max-age=3600")
     except Exception as e:
-        print(f"Error fetching asset history: {e}")
+        logger.exception("Error fetching asset history")
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to fetch asset history: {str(e)}"
         )
 
 
-@app.get(f"{settings.API_PREFIX}/assets")
+@router.get("/assets")
 async def get_assets(
-    min_value: Optional[float] = Query(
-        default=1, description="Minimum value threshold in USDT"
+    request: Request,
+    min_value: Decimal = Query(
+        default=Decimal("1"), description="Minimum value threshold in USDT"
     ),
 ) -> BaseDataResponse:
     """
@@ -309,53 +561,92 @@ async def get_assets(
         Dict with assets data from all exchanges
     """
     try:
-        asset_db = ServiceManager.get_asset_db()
+        asset_db = request.app.state.asset_db
+        # 先記下版本再讀取, 讀取期間若有寫入就不存入快取
+        version = asset_db.version
+
+        current_time = now_ms()
+        cached = _assets_payload_cache.get(min_value)
+        if cached and cached[1] == version and current_time - cached[0] < CACHE_TTL:
+            update_time, _, payload = cached
+            cache_headers = {
+                "ETag": f'W/"{update_time}-{min_value}"',
+                "Cache-Control": "public, max-age=60",
+            }
+            if _etag_matches(request, cache_headers["ETag"]):
+                return Response(status_code=304, headers=cache_headers)
+            return Response(content=payload, media_type="application/json", headers=cache_headers)
+
         recent_asset = await asset_db.get_asset_by_time_diff(CACHE_TTL)
 
         if recent_asset:
-            assets = await asset_db.get_all_assets()
-            exchanges_data = {}
-            for asset in assets:
-                if Decimal(asset["value_in_usdt"]) < min_value:
-                    continue
-                exchange = asset["exchange"]
-                if exchange not in exchanges_data:
-                    exchanges_data[exchange] = {}
-                exchanges_data[exchange][asset["symbol"]] = asset
-
-            asset_history_db = ServiceManager.get_asset_history_db()
-            summary = await asset_history_db.get_latest_snapshot()
+            cache_headers = {
+                "ETag": f'W/"{recent_asset["update_time"]}-{min_value}"',
+                "Cache-Control": "public, max-age=60",
+            }
+            if _etag_matches(request, cache_headers["ETag"]):
+                return Response(status_code=304, headers=cache_headers)
+
+            asset_history_db = request.app.state.asset_history_db
+            exchanges_data, summary = await asyncio.gather(
+                asset_db.get_assets_grouped(min_value),
+                asset_history_db.get_latest_snapshot(),
+            )
 
-            return BaseDataResponse(
-                status="success",
-                data={
-                    "exchanges": exchanges_data,
-                    "summary": summary
-                }
+            payload = orjson.dumps(
+                {
+                    "status": "success",
+                    "data": {
+                        "exchanges": exchanges_data,
+                        "summary": summary
+                    }
+                },
+                default=str
             )
+            for key in [
+                k for k, (t, v, _) in _assets_payload_cache.items()
+                if v != asset_db.version or current_time - t >= CACHE_TTL
+            ]:
+                del _assets_payload_cache[key]
+            if asset_db.version == version:
+                _assets_payload_cache[min_value] = (recent_asset["update_time"], version, payload)
+
+            return Response(content=payload, media_type="application/json", headers=cache_headers)
         
-        wallet_service = ServiceManager.get_wallet_service()
-        assets = await wallet_service.get_assets(Decimal(min_value))
-        
-        return BaseDataResponse(
-            status="success",
-            data=assets
+        # 同一個 min_value 同時只跑一次交易所刷新, 其他請求共用結果
+        refresh = _assets_refreshes.get(min_value)
+        if refresh is None:
+            wallet_service = request.app.state.wallet_service
+            refresh = asyncio.ensure_future(_refresh_assets(wallet_service, min_value))
+            _assets_refreshes[min_value] = refresh
+            refresh.add_done_callback(lambda _: _assets_refreshes.pop(min_value, None))
+
+        assets = await asyncio.shield(refresh)
+
+        return _json_response(
+            {"status": "success", "data": assets},
+            headers=None if "error" in assets else {"Cache-Control": "public, max-age=60"},
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch assets: {str(e)}")
 
 
-@app.get(f"{settings.API_PREFIX}/rates/usdt-twd")
-async def get_usdt_twd_rate() -> BaseDataResponse:
+@router.get("/rates/usdt-twd")
+async def get_usdt_twd_rate(request: Request) -> BaseDataResponse:
     """Get USDT to TWD exchange rate from MAX"""
     try:
-        base_exchange = ServiceManager.get_base_exchange()
-        quote_service = ServiceManager.get_quote_service()
-        rate = await quote_service.get_current_price(base_exchange.exchanges['bitopro'], "USDT/TWD")
-        if rate:
-            return BaseDataResponse(
-                status="success",
-                data={"rate": rate, "timestamp": datetime.now().isoformat()}
+        base_exchange = request.app.state.base_exchange
+        quote_service = request.app.state.quote_service
+
+        async def fetch_rate():
+            rate = await quote_service.get_current_price(base_exchange.exchanges['bitopro'], "USDT/TWD")
+            return {"rate": rate, "timestamp": datetime.now().isoformat()} if rate else None
+
+        data = await _cached(("usdt_twd_rate",), 30, fetch_rate, stale_ok=True)
+        if data:
+            return _json_response(
+                {"status": "success", "data": data},
+                headers={"Cache-Control": "public, max-age=30"},
             )
         return BaseResponse(
             status="error",
@@ -365,8 +656,9 @@ async def get_usdt_twd_rate() -> BaseDataResponse:
         raise HTTPException(status_code=503, detail=f"Could not fetch exchange rate: {str(e)}")
 
 
-@app.get(f"{settings.API_PREFIX}/orders")
+@router.get("/orders")
 async def get_orders(
+        request: Request,
         exchange: Optional[str] = Query(default=None, description="Exchange name"),
         symbol: Optional[str] = Query(default=None, description="Trading pair symbol"),
         status: Optional[str] = Query(default=None, description="Order status"),
@@ -378,8 +670,8 @@ async def get_orders(
         Dict with open orders data
     """
     try:
-        order_db = ServiceManager.get_order_db()
-        trading_service = ServiceManager.get_trading_service()
+        order_db = request.app.state.order_db
+        trading_service = request.app.state.trading_service
 
         open_orders = await order_db.find_orders(status="open")
 
@@ -398,10 +690,7 @@ async def get_orders(
             limit=limit
         )
         
-        return BaseDataResponse(
-            status="success",
-            data=orders
-        )
+        return _json_response({"status": "success", "data": orders})
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -409,8 +698,8 @@ async def get_orders(
         )
     
 
-@app.post(f"{settings.API_PREFIX}/orders")
-async def create_order(data: OpenOrderRequest) -> BaseDataResponse | BaseResponse:
+@router.post("/orders")
+async def create_order(request: Request, data: OpenOrderRequest) -> BaseDataResponse | BaseResponse:
     """
     Open a trading position
     
@@ -427,8 +716,8 @@ async def create_order(data: OpenOrderRequest) -> BaseDataResponse | BaseRespons
         BaseDataResponse with order details
     """
     try:
-        order_db = ServiceManager.get_order_db()
-        trading_service = ServiceManager.get_trading_service()
+        order_db = request.app.state.order_db
+        trading_service = request.app.state.trading_service
         exchange = trading_service.exchanges.get(data.exchange)
         
         if not exchange:
@@ -480,8 +769,8 @@ async def create_order(data: OpenOrderRequest) -> BaseDataResponse | BaseRespons
             detail=f"Failed to place order: {str(e)}"
         )
     
-@app.post(f"{settings.API_PREFIX}/orders/cancel")
-async def cancel_order(data: CancelOrderRequest) -> BaseResponse:
+@router.post("/orders/cancel")
+async def cancel_order(request: Request, data: CancelOrderRequest) -> BaseResponse:
     """
     Cancel an open order
     
@@ -492,8 +781,8 @@ async def cancel_order(data: CancelOrderRequest) -> BaseResponse:
         BaseResponse with status and message
     """
     try:
-        order_db = ServiceManager.get_order_db()
-        trading_service = ServiceManager.get_trading_service()
+        order_db = request.app.state.order_db
+        trading_service = request.app.state.trading_service
         order = await order_db.get_order_by_id(data.order_id)
         
         if not order:
@@ -531,8 +820,8 @@ async def cancel_order(data: CancelOrderRequest) -> BaseResponse:
         )
     
 
-@app.post(f"{settings.API_PREFIX}/transfer")
-async def transfer_between_exchange(data: TransferRequest) -> BaseDataResponse | BaseResponse:
+@router.post("/transfer")
+async def transfer_between_exchange(request: Request, data: TransferRequest) -> BaseDataResponse | BaseResponse:
     """
     Transfer funds between exchanges.
     
@@ -547,8 +836,8 @@ async def transfer_between_exchange(data: TransferRequest) -> BaseDataResponse |
         BaseDataResponse with transfer details
     """
     try:
-        transaction_db = ServiceManager.get_transaction_db()
-        transfer_service = ServiceManager.get_transfer_service()
+        transaction_db = request.app.state.transaction_db
+        transfer_service = request.app.state.transfer_service
         transaction = await transfer_service.transfer_between_exchange(
             from_exchange_name=data.from_exchange,
             to_exchange_name=data.to_exchange,
@@ -573,8 +862,9 @@ async def transfer_between_exchange(data: TransferRequest) -> BaseDataResponse |
             status_code=500, detail=f"Failed to transfer funds: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/networks/common")
+@router.get("/networks/common")
 async def get_common_networks(
+    request: Request,
     from_exchange: str = Query(..., description="Source exchange"),
     to_exchange: str = Query(..., description="Destination exchange"),
     currency: str = Query(..., description="Currency symbol"),
@@ -591,11 +881,12 @@ async def get_common_networks(
         List of common networks supported by both exchanges
     """
     try:
-        transfer_service = ServiceManager.get_transfer_service()
-        networks = await transfer_service.get_common_networks(
-            from_exchange, 
-            to_exchange, 
-            currency
+        transfer_service = request.app.state.transfer_service
+        # 網路與手續費很少變動, 短暫快取以減少對交易所的請求
+        networks = await _cached(
+            ("networks", "common", from_exchange, to_exchange, currency),
+            60,
+            lambda: transfer_service.get_common_networks(from_exchange, to_exchange, currency),
         )
         
         return BaseDataResponse(
@@ -608,8 +899,8 @@ async def get_common_networks(
             detail=f"Failed to get common networks: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/deposits/networks")
-async def get_deposit_networks(exchange: str, symbol: str) -> BaseDataResponse | BaseResponse:
+@router.get("/deposits/networks")
+async def get_deposit_networks(request: Request, exchange: str, symbol: str) -> BaseDataResponse | BaseResponse:
     """
     Get deposit networks for a symbol from an exchange.
     Parameters:
@@ -619,8 +910,12 @@ async def get_deposit_networks(exchange: str, symbol: str) -> BaseDataResponse |
         BaseDataResponse(status, data) | BaseResponse(status, message)
     """
     try:
-        transfer_service = ServiceManager.get_transfer_service()
-        networks = await transfer_service.get_deposit_networks(exchange, symbol)
+        transfer_service = request.app.state.transfer_service
+        networks = await _cached(
+            ("networks", "deposit", exchange, symbol),
+            60,
+            lambda: transfer_service.get_deposit_networks(exchange, symbol),
+        )
         if networks:
             return BaseDataResponse(
                 status="success",
@@ -637,8 +932,8 @@ async def get_deposit_networks(exchange: str, symbol: str) -> BaseDataResponse |
         )
 
 
-@app.get(f"{settings.API_PREFIX}/deposits/address")
-async def get_deposit_address(exchange: str, symbol: str, network: str) -> BaseDataResponse:
+@router.get("/deposits/address")
+async def get_deposit_address(request: Request, exchange: str, symbol: str, network: str) -> BaseDataResponse:
     """
     Get deposit address for a symbol from an exchange.
     Parameters:
@@ -649,7 +944,7 @@ async def get_deposit_address(exchange: str, symbol: str, network: str) -> BaseD
         Dict with deposit address
     """
     try:
-        transfer_service = ServiceManager.get_transfer_service()
+        transfer_service = request.app.state.transfer_service
         address = await transfer_service.get_deposit_address(exchange, symbol, network)
         return BaseDataResponse(
             status="success",
@@ -660,38 +955,45 @@ async def get_deposit_address(exchange: str, symbol: str, network: str) -> BaseD
             status_code=500, detail=f"Failed to get deposit address: {str(e)}"
         )
     
-@app.get(f"{settings.API_PREFIX}/charts/latest")
-async def get_latest_chart() -> BaseDataResponse:
+@router.get("/charts/latest")
+async def get_latest_chart(request: Request) -> BaseDataResponse:
     try:
-        chart_storage_db = ServiceManager.get_chart_storage_db()
-        chart = await chart_storage_db.get_latest_chart()
+        chart_storage_db = request.app.state.chart_storage_db
 
-        if not chart:
+        async def build_payload() -> Optional[Tuple[str, bytes]]:
+            chart = await chart_storage_db.get_latest_chart()
+            if not chart:
+                return None
+            return _encode_with_etag({"status": "success", "data": chart})
+
+        cached = await _cached(("charts", "latest"), 60, build_payload)
+
+        if not cached:
             return BaseDataResponse(
                 status="error",
                 data=None
             )
 
-        return BaseDataResponse(
-            status="success",
-            data=chart
-        )
+        # 圖表會被儲存/刪除改寫, 每次都要求客戶端重新驗證
+        etag, payload = cached
+        return _conditional_response(request, etag, payload, "no-cache")
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to get latest chart: {str(e)}"
         )
     
-@app.post(f"{settings.API_PREFIX}/charts/save")
-async def save_chart(data: ChartSaveRequest) -> BaseResponse:
+@router.post("/charts/save")
+async def save_chart(request: Request, data: ChartSaveRequest) -> BaseResponse:
     try:
-        chart_storage_db = ServiceManager.get_chart_storage_db()
+        chart_storage_db = request.app.state.chart_storage_db
         success = await chart_storage_db.save_chart(
             name=data.name,
             content=data.content,
             symbol=data.symbol,
             resolution=data.resolution
         )
+        _invalidate_cached("charts")
 
         if success:
             return BaseResponse(
@@ -708,12 +1010,13 @@ async def save_chart(data: ChartSaveRequest) -> BaseResponse:
             detail=f"Failed to save chart: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/charts/load")
+@router.get("/charts/load")
 async def load_chart(
+    request: Request,
     id: int = Query(..., description="Chart id")
 ) -> BaseDataResponse:
     try:
-        chart_storage_db = ServiceManager.get_chart_storage_db()
+        chart_storage_db = request.app.state.chart_storage_db
         chart = await chart_storage_db.get_chart(
             id=id
         )
@@ -724,45 +1027,47 @@ async def load_chart(
                 data=None
             )
 
-        return BaseDataResponse(
-            status="success",
-            data=chart
-        )
+        etag, payload = _encode_with_etag({"status": "success", "data": chart})
+        return _conditional_response(request, etag, payload, "no-cache")
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to load chart: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/charts/list")
-async def list_charts() -> BaseDataResponse:
+@router.get("/charts/list")
+async def list_charts(request: Request) -> BaseDataResponse:
     """
     List all saved charts
     """
     try:
-        chart_storage_db = ServiceManager.get_chart_storage_db()
-        charts = await chart_storage_db.get_all_charts()
+        chart_storage_db = request.app.state.chart_storage_db
 
-        return BaseDataResponse(
-            status="success",
-            data=charts
-        )
+        # list_charts 失敗時拋出例外, _cached 不會保存失敗的結果
+        async def build_payload() -> Tuple[str, bytes]:
+            charts = await chart_storage_db.list_charts()
+            return _encode_with_etag({"status": "success", "data": charts})
+
+        etag, payload = await _cached(("charts", "list"), 60, build_payload)
+        return _conditional_response(request, etag, payload, "no-cache")
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to list charts: {str(e)}"
         )
 
-@app.delete(f"{settings.API_PREFIX}/charts/delete")
+@router.delete("/charts/delete")
 async def delete_chart(
+    request: Request,
     id: int = Query(..., description="Chart id")
 ) -> BaseResponse:
     """
     Delete chart configuration
     """
     try:
-        chart_storage_db = ServiceManager.get_chart_storage_db()
+        chart_storage_db = request.app.state.chart_storage_db
         success = await chart_storage_db.delete_chart(id=id)
+        _invalidate_cached("charts")
 
         if success:
             return BaseResponse(
@@ -779,87 +1084,67 @@ async def delete_chart(
             detail=f"Failed to delete chart: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/quotes/symbols")
+@router.get("/quotes/symbols")
 async def get_symbols(
-    min_value: Optional[float] = Query(
-        default=1, description="Minimum value threshold in USDT"
+    request: Request,
+    min_value: Decimal = Query(
+        default=Decimal("1"), description="Minimum value threshold in USDT"
     )
 ) -> BaseDataResponse:
     try:
         trading_symbols = []
         
-        asset_db = ServiceManager.get_asset_db()
-        assets = await asset_db.get_all_assets()
+        asset_db = request.app.state.asset_db
+        assets = await asset_db.get_asset_symbols(min_value)
         
         for asset in assets:
-            if Decimal(asset.get("value_in_usdt", "0")) >= min_value and (asset['symbol'] != "USDT" and asset['symbol'] != "USDC"):
+            if asset['symbol'] not in _QUOTE_STABLECOINS:
                 symbol = f"{asset['symbol']}USDT"
+                exchange_upper = asset['exchange'].upper()
                 trading_symbols.append({
                     "symbol": symbol,
-                    "full_name": f"{asset['exchange'].upper()}:{symbol}",
+                    "full_name": f"{exchange_upper}:{symbol}",
                     "description": f"{asset['symbol']} / Tether",
-                    "exchange": asset['exchange'].upper(),
+                    "exchange": exchange_upper,
                     "type": "balance"
                 })
         
-        try:
-            possible_paths = [
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbol_exchange_mapping.json"),
-                os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
-                            "CryptoAssetsManager", 
-                            "symbol_exchange_mapping.json"),
-                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                            "symbol_exchange_mapping.json")
-            ]
-
-            file_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    file_path = path
-                    break
-
-            with open(file_path, "r") as f:
-                mapping_data = json.load(f)
-                
-            for exchange, symbols in mapping_data.items():
-                if exchange == "Upbit":
+        mapping_data = request.app.state.symbol_mapping
+
+        seen = {(item["exchange"], item["symbol"]) for item in trading_symbols}
+
+        for exchange, symbols in mapping_data.items():
+            if exchange == "Upbit":
+                continue
+
+            exchange_upper = exchange.upper()
+            for symbol in symbols:
+                symbol_with_usdt = f"{symbol}USDT"
+                key = (exchange_upper, symbol_with_usdt)
+                if key in seen:
                     continue
 
-                for symbol in symbols:
-                    symbol_with_usdt = f"{symbol}USDT"
-                    existing = next(
-                        (item for item in trading_symbols 
-                         if item["symbol"] == symbol_with_usdt and 
-                         item["exchange"] == exchange.upper()),
-                        None
-                    )
-                    
-                    if not existing:
-                        trading_symbols.append({
-                            "symbol": symbol_with_usdt,
-                            "full_name": f"{exchange.upper()}:{symbol_with_usdt}",
-                            "description": f"{symbol} / Tether",
-                            "exchange": exchange.upper(),
-                            "type": "watch list"
-                        })
-        
-        except FileNotFoundError:
-            print("Symbol mapping file not found")
-            
-        return BaseDataResponse(
-            status="success",
-            data=trading_symbols
-        )
+                seen.add(key)
+                trading_symbols.append({
+                    "symbol": symbol_with_usdt,
+                    "full_name": f"{exchange_upper}:{symbol_with_usdt}",
+                    "description": f"{symbol} / Tether",
+                    "exchange": exchange_upper,
+                    "type": "watch list"
+                })
+    
+        return _json_response({"status": "success", "data": trading_symbols})
         
     except Exception as e:
-        print(f"Error getting trading symbols: {e}")
+        logger.exception("Error getting trading symbols")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get trading symbols: {str(e)}"
         )
     
-@app.get(f"{settings.API_PREFIX}/quotes/history")
+@router.get("/quotes/history")
 async def get_quote_history(
+    request: Request,
     symbol: str = Query(..., description="Trading pair symbol"),
     exchange: str = Query(..., description="Exchange name"),
     timeframe: str = Query(..., description="Timeframe"),
@@ -878,23 +1163,31 @@ async def get_quote_history(
         Dict with historical price data
     """
     try:
-        quote_service = ServiceManager.get_quote_service()
-        exchange = quote_service.exchanges.get(exchange)
-        history = await quote_service.get_price_history(
-            exchange, symbol, timeframe, since, end
-        )
+        quote_service = request.app.state.quote_service
+        exchange_instance = quote_service.exchanges.get(exchange)
 
-        return BaseDataResponse(
-            status="success",
-            data=history['data']
+        async def fetch_history():
+            history = await quote_service.get_price_history(
+                exchange_instance, symbol, timeframe, since, end
+            )
+            if "error" in history:
+                raise RuntimeError(history["error"])
+            return history["data"]
+
+        # 相同參數的同時請求共用一次交易所查詢, 結果短暫保留
+        data = await _cached(
+            ("quote_history", exchange, symbol, timeframe, since, end), 5, fetch_history
         )
+
+        return _json_response({"status": "success", "data": data})
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get quote history: {str(e)}"
         )
 
-@app.get(f"{settings.API_PREFIX}/quotes/latest")
+@router.get("/quotes/latest")
 async def get_latest_quote(
+    request: Request,
     symbol: str = Query(..., description="Trading pair symbol"),
     exchange: str = Query(..., description="Exchange name")
 ) -> BaseDataResponse:
@@ -907,7 +1200,7 @@ async def get_latest_quote(
         Dict with latest price data
     """
     try:
-        quote_service = ServiceManager.get_quote_service()
+        quote_service = request.app.state.quote_service
         exchange = quote_service.exchanges.get(exchange)
         latest = await quote_service.get_current_price(exchange, symbol)
 
@@ -928,10 +1221,10 @@ async def websocket_endpoint(
     symbol: str,
     timeframe: str = Query(default="1m")
 ) -> None:
-    websocket_service = ServiceManager.get_websocket_service()
+    websocket_service = websocket.app.state.websocket_service
+    # accept 失敗時還沒有任何訂閱, 不需要 disconnect
+    await websocket_service.connect(websocket)
     try:
-        await websocket_service.connect(websocket)
-        
         await websocket_service.subscribe(
             exchange_name=exchange,
             symbol=symbol, 
@@ -939,21 +1232,36 @@ async def websocket_endpoint(
             data_type=data_type,
             timeframe=timeframe
         )
-        
-        while True:
-            try:
-                await websocket.receive_text()
-            except WebSocketDisconnect:
-                break
-            
-    except Exception as e:
-        print(f"WebSocket error: {str(e)}")
-        
+
+        # 客戶端訊息只用來偵測斷線, 直接讀原始 ASGI 訊息, 不做文字解碼
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        logger.exception("WebSocket error")
+
     finally:
         await websocket_service.disconnect(websocket)
 
+
+app.include_router(router)
+
 # Error handlers
 @app.exception_handler(Exception)
-async def general_exception_handler(request, exc):
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """Global exception handler"""
-    return {"status": "error", "message": str(exc), "path": request.url.path}
+    # 直接讀 scope 裡的原始路徑, 不建立 URL 物件
+    path = request.scope.get("path", "")
+    logger.error(
+        "Unhandled error on %s %s",
+        request.method,
+        path,
+        exc_info=exc,
+        extra={"path": path},
+    )
+    return _json_response(
+        {"status": "error", "message": str(exc), "path": path},
+        status_code=500,
+    )
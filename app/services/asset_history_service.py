@@ -1,13 +1,16 @@
+import logging
 import asyncio
 from decimal import Decimal
 from typing import List, Dict, Optional
-from datetime import datetime, timezone, timedelta
 
 from app.database.asset import AssetDB
-from app.database.asset_history import AssetHistoryDB
+from app.database.asset_history import AssetHistoryDB, DAY_MS
+from app.database.base import now_ms
 from app.services.exchange.wallet_service import WalletService
 from app.structures.asset_structure import AssetSummary
 
+logger = logging.getLogger(__name__)
+
 
 class AssetHistoryService:
     def __init__(
@@ -22,39 +25,23 @@ class AssetHistoryService:
         self.asset_history_db = asset_history_db
 
     def __convert_to_daily_timestamp(self, timestamp: int) -> int:
-        return (timestamp // 86400000) * 86400000
+        return (timestamp // DAY_MS) * DAY_MS
     
     async def get_current_assets(self, min_value: Decimal = Decimal("1")) -> Optional[Dict]:
         recent_asset = await self.asset_db.get_asset_by_time_diff(3600000)
 
         if recent_asset:
-            assets = await self.asset_db.get_all_assets()
-            if assets:
-                exchanges_data = {}
-                total = Decimal("0")
-                profit = Decimal("0")
-                initial = Decimal("0")
-
-                for asset in assets:
-                    if Decimal(asset["value_in_usdt"]) < min_value:
-                        continue
-                    exchange = asset["exchange"]
-                    if exchange not in exchanges_data:
-                        exchanges_data[exchange] = {}
-                    exchanges_data[exchange][asset["symbol"]] = asset
-                    
-                    total += Decimal(asset["value_in_usdt"])
-                    profit += Decimal(asset["profit_usdt"])
-                    initial += Decimal(asset["total"]) * Decimal(asset["avg_price"])
-
+            # 過濾、分組與加總都在 MongoDB 完成; 查詢失敗時才改向交易所取得
+            portfolio = await self.asset_db.aggregate_portfolio_value(min_value)
+            if portfolio is not None:
                 summary = AssetSummary.calculate_summary(
-                    total=total,
-                    profit=profit,
-                    initial=initial
+                    total=portfolio["total"],
+                    profit=portfolio["profit"],
+                    initial=portfolio["initial"]
                 )
 
                 return {
-                    "exchanges": exchanges_data,
+                    "exchanges": portfolio["exchanges"],
                     "summary": summary.model_dump()
                 }
 
@@ -70,11 +57,9 @@ class AssetHistoryService:
         Returns:
             List[AssetSnapshot]: List of snapshots for the period
         """
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(days=period)
-
-        end_timestamp = self.__convert_to_daily_timestamp(int(end_time.timestamp() * 1000))
-        start_timestamp = self.__convert_to_daily_timestamp(int(start_time.timestamp() * 1000))
+        # 含今天共 period 天, 區間內的筆數才會與 limit 一致
+        end_timestamp = self.__convert_to_daily_timestamp(now_ms())
+        start_timestamp = end_timestamp - (period - 1) * DAY_MS
 
         snapshots = await self.asset_history_db.get_snapshots_by_timeframe(
             start_timestamp, end_timestamp, limit=period
@@ -94,7 +79,7 @@ class AssetHistoryService:
         while curr_timestamp <= end_timestamp:
             if curr_timestamp not in existing_timestamps:
                 missing_timestamps.append(curr_timestamp)
-            curr_timestamp += 86400000
+            curr_timestamp += DAY_MS
             
         if not missing_timestamps:
             return snapshots
@@ -170,15 +155,15 @@ class AssetHistoryService:
 
                     snapshot = {
                         "timestamp": timestamp,
-                        "update_time": int(datetime.now(timezone.utc).timestamp() * 1000),
+                        "update_time": now_ms(),
                         **summary.model_dump_for_db()
                     }
                     
                     await self.asset_history_db.update_history(snapshot)
                     filled_snapshots.append(snapshot)
 
-            except Exception as e:
-                print(f"Error calculating snapshot for timestamp {timestamp}: {e}")
+            except Exception:
+                logger.exception("Error calculating snapshot for timestamp %s", timestamp)
                 continue
 
         all_snapshots = snapshots + filled_snapshots
@@ -189,12 +174,12 @@ class AssetHistoryService:
     async def update_daily_snapshot(self, timestamp: Optional[int] = None) -> bool:
         try:
             if timestamp is None:
-                timestamp = self.__convert_to_daily_timestamp(int(datetime.now(timezone.utc).timestamp() * 1000))
+                timestamp = self.__convert_to_daily_timestamp(now_ms())
 
             assets = await self.wallet_service.get_assets(timestamp=timestamp)
             
             return (assets) or ("error" not in assets)
 
-        except Exception as e:
-            print(f"Error updating daily snapshot: {e}")
+        except Exception:
+            logger.exception("Error updating daily snapshot")
             return False
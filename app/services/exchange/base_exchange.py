@@ -1,3 +1,4 @@
+import logging
 import re
 import asyncio
 from dataclasses import dataclass
@@ -6,6 +7,9 @@ from typing import Dict, Optional, Union
 import ccxt.async_support as ccxt
 
 from app.config import settings
+from app.services.exchange.http_session import HttpSession
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -70,18 +74,20 @@ class ExchangeRegistry:
                 exchange_class = getattr(ccxt, exchange_name)
                 
             if not exchange_class:
-                print(f"Exchange {exchange_name} not found in CCXT")
+                logger.warning("Exchange %s not found in CCXT", exchange_name)
                 return None
 
             config = {
                 **credentials.to_dict(),
                 "enableRateLimit": settings.ENABLE_RATE_LIMIT,
-                "timeout": settings.API_CONNECT_TIMEOUT
+                "timeout": settings.API_CONNECT_TIMEOUT,
+                # 所有 ccxt 實例共用同一個連線池
+                "session": HttpSession.get_session(),
             }
             return exchange_class(config)
             
-        except Exception as e:
-            print(f"Error creating {exchange_name} instance: {str(e)}")
+        except Exception:
+            logger.exception("Error creating %s instance", exchange_name)
             return None
 
     def create_exchange_instances(self) -> Dict[str, ccxt.Exchange]:
@@ -136,8 +142,8 @@ class BaseExchange:
             # await exchange.fetch_deposit_withdraw_fees("BTC")
             await exchange.fetch_balance()
             return True
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error pinging exchange")
             return False
 
     async def ping_exchanges(self) -> Optional[Dict[str, Union[bool, str]]]:
@@ -157,6 +163,6 @@ class BaseExchange:
             return {
                 name: result for name, result in zip(self.exchanges.keys(), results)
             }
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error pinging exchanges")
             return None
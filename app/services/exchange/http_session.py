@@ -0,0 +1,35 @@
+import ssl
+import socket
+from typing import Optional
+
+import certifi
+import aiohttp
+
+
+class HttpSession:
+    """
+    Shared aiohttp session for every ccxt REST instance, so all services reuse
+    one keep-alive connection pool instead of one pool per exchange instance.
+    """
+    session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        if cls.session is None or cls.session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=ssl.create_default_context(cafile=certifi.where()),
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                family=socket.AF_UNSPEC,
+                enable_cleanup_closed=True,
+            )
+            cls.session = aiohttp.ClientSession(connector=connector)
+        return cls.session
+
+    @classmethod
+    async def close(cls):
+        if cls.session is not None:
+            await cls.session.close()
+            cls.session = None
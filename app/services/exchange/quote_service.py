@@ -1,3 +1,4 @@
+import logging
 from decimal import Decimal
 from typing import Dict, Union, List
 
@@ -5,6 +6,8 @@ import ccxt.async_support as ccxt
 
 from app.services.exchange.base_exchange import BaseExchange
 
+logger = logging.getLogger(__name__)
+
 
 class QuoteService(BaseExchange):
     def __init__(self):
@@ -105,8 +108,8 @@ class QuoteService(BaseExchange):
                 return {}
 
             return {candle["timestamp"]: Decimal(str(candle["close"])) for candle in price_history["data"]}
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting close price from history")
             return {}
 
     async def get_last_close_price_from_history(
@@ -133,8 +136,8 @@ class QuoteService(BaseExchange):
                 return Decimal(0)
 
             return Decimal(str(price_history["data"][-1]["close"]))
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting last close price from history")
             return Decimal(0)
         
     async def get_current_price(self, exchange: ccxt.Exchange, symbol: str) -> dict:
@@ -152,8 +155,8 @@ class QuoteService(BaseExchange):
             ticker = await exchange.fetch_ticker(symbol)
             price = ticker.get("last", Decimal(0))
             return {"price": price}
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting current price")
             return {}
 
     async def get_current_price_decimal(self, exchange: ccxt.Exchange, symbol: str) -> Decimal:
@@ -169,10 +172,10 @@ class QuoteService(BaseExchange):
         """
         try:
             ticker = await exchange.fetch_ticker(symbol)
-            price = Decimal(ticker.get("last", Decimal(0)))
+            price = Decimal(str(ticker.get("last", 0)))
             return price
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting current price")
             return Decimal(0)
 
     async def get_current_prices_decimal(
@@ -192,6 +195,6 @@ class QuoteService(BaseExchange):
             tickers = await exchange.fetch_tickers(symbols)
             prices = {k: Decimal(str(v.get("last", "0"))) for k, v in tickers.items()}
             return prices
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting current prices")
             return Decimal(0)
@@ -1,3 +1,4 @@
+import logging
 from typing import Dict, List
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -7,6 +8,8 @@ from app.structures.order_structure import Order
 from app.services.exchange.base_exchange import BaseExchange
 from app.services.exchange.quote_service import QuoteService
 
+logger = logging.getLogger(__name__)
+
 
 class TradingService(BaseExchange):
     def __init__(self, quote_service: QuoteService):
@@ -236,6 +239,6 @@ class TradingService(BaseExchange):
 
             return trades
 
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting trade history")
             return []
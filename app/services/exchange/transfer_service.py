@@ -1,4 +1,6 @@
 import re
+import asyncio
+import logging
 from typing import Dict, Optional
 
 import ccxt.async_support as ccxt
@@ -6,6 +8,8 @@ import ccxt.async_support as ccxt
 from app.services.exchange.base_exchange import BaseExchange
 from app.structures.transfer_structure import Transaction
 
+logger = logging.getLogger(__name__)
+
 
 class TransferService(BaseExchange):
     def __init__(self):
@@ -53,8 +57,10 @@ class TransferService(BaseExchange):
             }
         """
         try:
-            source_networks = await self.get_deposit_networks(from_exchange, currency)
-            destination_networks = await self.get_deposit_networks(to_exchange, currency)
+            source_networks, destination_networks = await asyncio.gather(
+                self.get_deposit_networks(from_exchange, currency),
+                self.get_deposit_networks(to_exchange, currency),
+            )
 
             if (not source_networks) or (not destination_networks):
                 return {}
@@ -70,8 +76,8 @@ class TransferService(BaseExchange):
 
             return common_networks
         
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting common networks")
             return {}
 
     async def get_deposit_networks(self, exchange_name: str, currency: str) -> Dict:
@@ -126,8 +132,8 @@ class TransferService(BaseExchange):
 
             return networks
 
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting deposit networks")
             return {}
 
     async def get_deposit_address(
@@ -162,8 +168,8 @@ class TransferService(BaseExchange):
                 "tag": data.get("tag", ""),
             }
 
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error getting deposit address")
             return {}
 
     async def withdraw(
@@ -204,8 +210,8 @@ class TransferService(BaseExchange):
             
             return response
             
-        except Exception as e:
-            print(f"Withdrawal error: {str(e)}")
+        except Exception:
+            logger.exception("Withdrawal error")
             return {}
         
     async def transfer_between_exchange(
@@ -264,6 +270,6 @@ class TransferService(BaseExchange):
 
             return transaction
             
-        except Exception as e:
-            print(f"Transfer error: {str(e)}")
+        except Exception:
+            logger.exception("Transfer error")
             return {}
\ No newline at end of file
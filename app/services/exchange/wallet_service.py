@@ -1,3 +1,4 @@
+import logging
 import asyncio
 from decimal import Decimal
 from typing import Dict, Optional, Union
@@ -12,6 +13,8 @@ from app.services.exchange.base_exchange import BaseExchange
 from app.services.exchange.quote_service import QuoteService
 from app.services.exchange.trading_service import TradingService
 
+logger = logging.getLogger(__name__)
+
 
 class WalletService(BaseExchange):
     def __init__(
@@ -48,8 +51,8 @@ class WalletService(BaseExchange):
                 asset = Asset.calculate_metrics(
                     exchange=exchange.id,
                     symbol=symbol,
-                    free=Decimal(balance["free"][symbol]),
-                    used=Decimal(balance["used"][symbol]),
+                    free=Decimal(str(balance["free"][symbol])),
+                    used=Decimal(str(balance["used"][symbol])),
                     total=total_amount,
                     avg_price=Decimal("1"),
                     current_price=Decimal("1")
@@ -98,23 +101,16 @@ class WalletService(BaseExchange):
                 asset = Asset.calculate_metrics(
                     exchange=exchange.id,
                     symbol=symbol,
-                    free=Decimal(balance["free"][symbol]),
-                    used=Decimal(balance["used"][symbol]),
+                    free=Decimal(str(balance["free"][symbol])),
+                    used=Decimal(str(balance["used"][symbol])),
                     total=total_amount,
                     avg_price=avg_price,
                     current_price=current_price
                 )
 
-            if asset:
-                await self.asset_db.update_asset(
-                    exchange=exchange.id,
-                    symbol=symbol,
-                    data=asset.model_dump_for_db()
-                )
-
             return asset
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Error processing symbol")
             return None
 
     async def __get_okx_balance(self, exchange: ccxt.Exchange) -> dict:
@@ -162,12 +158,19 @@ class WalletService(BaseExchange):
 
             results = await asyncio.gather(*tasks)
 
-            return {
+            assets = {
                 symbol: result
                 for symbol, result in zip(balance["total"].keys(), results)
                 if result is not None
             }
 
+            await self.asset_db.bulk_update_assets([
+                (exchange.id, symbol, asset.model_dump_for_db())
+                for symbol, asset in assets.items()
+            ])
+
+            return assets
+
         except Exception as e:
             return {"error": str(e)}
 
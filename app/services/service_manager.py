@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from typing import Optional
 
 from app.database.connection import MongoDB
@@ -10,11 +12,14 @@ from app.database.chart_storage import ChartStorageDB
 from app.services.websocket_service import WebSocketService
 from app.services.asset_history_service import AssetHistoryService
 from app.services.exchange.base_exchange import BaseExchange
+from app.services.exchange.http_session import HttpSession
 from app.services.exchange.quote_service import QuoteService
 from app.services.exchange.wallet_service import WalletService
 from app.services.exchange.trading_service import TradingService
 from app.services.exchange.transfer_service import TransferService
 
+logger = logging.getLogger(__name__)
+
 
 class ServiceManager:
     # database services
@@ -149,34 +154,32 @@ class ServiceManager:
             asset_cost_db = cls.get_asset_cost_db()
             chart_storage_db = cls.get_chart_storage_db()
             
-            # Initialize database indexes
-            await asset_db.create_indexes()
-            await order_db.create_indexes()
-            await transaction_db.create_indexes()
-            await asset_history_db.create_indexes()
-            await asset_cost_db.create_indexes()
-            await chart_storage_db.create_indexes()
-
             # Initialize exchange services
             base_exchange = cls.get_base_exchange()
-            await base_exchange.initialize_exchanges_by_server()
-
             wallet_service = cls.get_wallet_service()
-            await wallet_service.initialize_exchanges_by_server()
-
             transfer_service = cls.get_transfer_service()
-            await transfer_service.initialize_exchanges_by_server()
-
             quote_service = cls.get_quote_service()
-            await quote_service.initialize_exchanges_by_server()
-
             trading_service = cls.get_trading_service()
-            await trading_service.initialize_exchanges_by_server()
 
-            print("Services initialized successfully")
+            # 索引建立與交易所初始化互不相依, 一起送出縮短啟動時間
+            await asyncio.gather(
+                asset_db.create_indexes(),
+                order_db.create_indexes(),
+                transaction_db.create_indexes(),
+                asset_history_db.create_indexes(),
+                asset_cost_db.create_indexes(),
+                chart_storage_db.create_indexes(),
+                base_exchange.initialize_exchanges_by_server(),
+                wallet_service.initialize_exchanges_by_server(),
+                transfer_service.initialize_exchanges_by_server(),
+                quote_service.initialize_exchanges_by_server(),
+                trading_service.initialize_exchanges_by_server(),
+            )
+
+            logger.info("Services initialized successfully")
 
-        except Exception as e:
-            print(f"Failed to initialize services: {str(e)}")
+        except Exception:
+            logger.exception("Failed to initialize services")
             raise
 
     @classmethod
@@ -186,13 +189,16 @@ class ServiceManager:
                 for exchange_name, exchange in cls._base_exchange.exchanges.items():
                     try:
                         await exchange.close()
-                        print(f"Closed connection to {exchange_name}")
-                    except Exception as e:
-                        print(f"Error closing {exchange_name} connection: {str(e)}")
+                        logger.info("Closed connection to %s", exchange_name)
+                    except Exception:
+                        logger.exception("Error closing %s connection", exchange_name)
+
+            # ccxt 實例不會關閉共用的 session, 需要在這裡關閉
+            await HttpSession.close()
 
             # Cleanup websocket service
             if cls._websocket_service:
-                await cls._websocket_service.stop()
+                await cls._websocket_service.close()
 
-        except Exception as e:
-            print(f"Error during cleanup: {str(e)}")
+        except Exception:
+            logger.exception("Error during cleanup")
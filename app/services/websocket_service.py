@@ -1,9 +1,16 @@
+import logging
 import asyncio
 from typing import Dict, Set, Optional
 
+import orjson
 import ccxt.pro as ccxtpro
 from fastapi import WebSocket
 
+logger = logging.getLogger(__name__)
+
+# 每個客戶端最多暫存的訊息數, 超過時丟棄最舊的訊息
+CLIENT_QUEUE_SIZE = 64
+
 
 class WebSocketService:
     def __init__(self):
@@ -24,6 +31,9 @@ class WebSocketService:
         }
         self.exchanges: Dict[str, ccxtpro.Exchange] = {}
         self.tasks = set()
+        # 每個客戶端各自的待送訊息佇列與傳送 task
+        self.queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.senders: Dict[WebSocket, asyncio.Task] = {}
 
     def get_exchange(self, exchange_name: str) -> Optional[ccxtpro.Exchange]:
         if exchange_name not in self.exchanges:
@@ -35,6 +45,9 @@ class WebSocketService:
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.queues[websocket] = queue
+        self.senders[websocket] = asyncio.create_task(self.send_loop(websocket, queue))
 
     async def disconnect(self, websocket: WebSocket):
         for data_type in self.subscriptions:
@@ -43,6 +56,39 @@ class WebSocketService:
                     if websocket in self.subscriptions[data_type][exchange_id][symbol]:
                         await self.unsubscribe(exchange_id, symbol, websocket, data_type)
 
+        self.queues.pop(websocket, None)
+        sender = self.senders.pop(websocket, None)
+        if sender and sender is not asyncio.current_task():
+            sender.cancel()
+
+    async def send_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        try:
+            while True:
+                await websocket.send_text(await queue.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error sending message to client")
+            await self.disconnect(websocket)
+
+    def broadcast(self, data_type: str, exchange_name: str, symbol: str, message: Dict):
+        """
+        Encode the message once and queue it for every subscriber.
+        A slow client only drops its own oldest messages instead of stalling the loop.
+        """
+        subscribers = self.subscriptions[data_type].get(exchange_name, {}).get(symbol)
+        if not subscribers:
+            return
+
+        payload = orjson.dumps(message).decode()
+        for websocket in subscribers:
+            queue = self.queues.get(websocket)
+            if queue is None:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
     async def subscribe(
             self, 
             exchange_name: str, 
@@ -120,16 +166,10 @@ class WebSocketService:
                     "last": ticker['last'],
                     "timestamp": ticker['timestamp']
                 }
-                
-                websockets = self.subscriptions['ticker'][exchange_name][symbol].copy()
-                for websocket in websockets:
-                    try:
-                        await websocket.send_json(message)
-                    except Exception:
-                        await self.unsubscribe(exchange_name, symbol, websocket, 'ticker')
-                        
-        except Exception as e:
-            print(f"Error in {exchange_name} ticker loop for {symbol}: {str(e)}")
+                self.broadcast('ticker', exchange_name, symbol, message)
+
+        except Exception:
+            logger.exception("Error in %s ticker loop for %s", exchange_name, symbol)
         finally:
             if (exchange_name in self.subscriptions['ticker'] and 
                 symbol in self.subscriptions['ticker'][exchange_name]):
@@ -158,16 +198,10 @@ class WebSocketService:
                         "close": last_candle[4],
                         "volume": last_candle[5]
                     }
-                    
-                    websockets = self.subscriptions['ohlcv'][exchange_name][symbol].copy()
-                    for websocket in websockets:
-                        try:
-                            await websocket.send_json(message)
-                        except Exception:
-                            await self.unsubscribe(exchange_name, symbol, websocket, 'ohlcv')
-                        
-        except Exception as e:
-            print(f"Error in {exchange_name} ohlcv loop for {symbol}: {str(e)}")
+                    self.broadcast('ohlcv', exchange_name, symbol, message)
+
+        except Exception:
+            logger.exception("Error in %s ohlcv loop for %s", exchange_name, symbol)
         finally:
             if (exchange_name in self.subscriptions['ohlcv'] and 
                 symbol in self.subscriptions['ohlcv'][exchange_name]):
@@ -192,30 +226,28 @@ class WebSocketService:
                         "quantity": float(latest_trade['amount']),
                         "timestamp": latest_trade['timestamp']
                     }
-                    
-                    websockets_to_remove = set()
-                    websockets = self.subscriptions['aggTrade'][exchange_name][symbol].copy()
-                    for websocket in websockets:
-                        try:
-                            await websocket.send_json(message)
-                        except Exception as e:
-                            print(f"Error sending message to client: {str(e)}")
-                            websockets_to_remove.add(websocket)
-                    
-                    for ws in websockets_to_remove:
-                        await self.unsubscribe(exchange_name, symbol, ws, 'aggTrade')
-                        
-        except Exception as e:
-            print(f"Error in {exchange_name} aggTrade loop for {symbol}: {str(e)}")
+                    self.broadcast('aggTrade', exchange_name, symbol, message)
+
+        except Exception:
+            logger.exception("Error in %s aggTrade loop for %s", exchange_name, symbol)
         finally:
             if (exchange_name in self.subscriptions['aggTrade'] and 
                 symbol in self.subscriptions['aggTrade'][exchange_name]):
                 del self.subscriptions['aggTrade'][exchange_name][symbol]
 
     async def close(self):
+        # 先停止行情迴圈與每個客戶端的傳送 task, 等它們結束後再關閉交易所連線
+        tasks = [*self.tasks, *self.senders.values()]
+        self.tasks.clear()
+        self.senders.clear()
+        self.queues.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
         for exchange_id, exchange in self.exchanges.items():
             try:
                 await exchange.close()
-            except Exception as e:
-                print(f"Error closing {exchange_id} exchange: {e}")
+            except Exception:
+                logger.exception("Error closing %s exchange", exchange_id)
         self.exchanges.clear()
\ No newline at end of file
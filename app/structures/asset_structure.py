@@ -1,6 +1,7 @@
 from decimal import Decimal
 from pydantic import BaseModel
-from datetime import datetime, timezone
+
+from app.database.base import now_ms
 
 class Asset(BaseModel):
     exchange: str
@@ -40,15 +41,12 @@ class Asset(BaseModel):
             roi=roi,
             value_in_usdt=value_in_usdt,
             profit_usdt=profit_usdt,
-            update_time=int(datetime.now(timezone.utc).timestamp() * 1000)
+            update_time=now_ms()
         )
     
     def model_dump_for_db(self) -> dict:
-        data = self.model_dump()
-        for key, value in data.items():
-            if isinstance(value, Decimal):
-                data[key] = str(value)
-        return data
+        # Decimal 交給 MongoDBBase 的 DecimalCodec 轉成 Decimal128 儲存
+        return self.model_dump()
     
 class AssetSummary(BaseModel):
     total: Decimal
@@ -67,11 +65,8 @@ class AssetSummary(BaseModel):
         )
     
     def model_dump_for_db(self) -> dict:
-        data = self.model_dump()
-        for key, value in data.items():
-            if isinstance(value, Decimal):
-                data[key] = str(value)
-        return data
+        # Decimal 交給 MongoDBBase 的 DecimalCodec 轉成 Decimal128 儲存
+        return self.model_dump()
 
 class AssetHistory(BaseModel):
     timestamp: int
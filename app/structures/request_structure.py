@@ -1,11 +1,19 @@
+from enum import IntEnum
+from decimal import Decimal
 from typing import Dict
 from typing import Optional
 from pydantic import BaseModel, Field
 
+class HistoryPeriod(IntEnum):
+    DAYS_30 = 30
+    DAYS_90 = 90
+    DAYS_180 = 180
+    DAYS_365 = 365
+
 class AssetCostUpdate(BaseModel):
     exchange: str
     symbol: str
-    cost: str
+    cost: Decimal  # 以字串傳入可保留精度
 
 class ExchangeAPISettings(BaseModel):
     api_key: str = Field(..., description="API Key for the exchange")
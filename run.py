@@ -1,3 +1,5 @@
+import sys
+
 import uvicorn
 
 from app.config import settings
@@ -9,4 +11,7 @@ if __name__ == "__main__":
         port=5001,
         reload=settings.DEBUG,
         workers=1,
+        # uvloop 不支援 Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.database.asset_history import DAY_MS
+from app.database.base import now_ms
+from app.services.asset_history_service import AssetHistoryService
+
+
+class FakeAssetHistoryDB:
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+
+    async def get_snapshots_by_timeframe(self, start_time, end_time, limit=None, fields=None):
+        # 與 MongoDB 查詢相同: 區間過濾, timestamp 升冪, 再套用 limit
+        result = sorted(
+            (s for s in self.snapshots if start_time <= s["timestamp"] <= end_time),
+            key=lambda s: s["timestamp"]
+        )
+        return result[:limit] if limit else result
+
+
+def test_asset_history_keeps_newest_snapshot():
+    period = 30
+    today = now_ms() // DAY_MS * DAY_MS
+    snapshots = [{"timestamp": today - i * DAY_MS} for i in range(period + 1)]
+
+    async def unexpected_current_assets(*args, **kwargs):
+        raise AssertionError("history is complete, no gap filling expected")
+
+    service = AssetHistoryService(
+        wallet_service=SimpleNamespace(quote_service=None),
+        asset_db=None,
+        asset_history_db=FakeAssetHistoryDB(snapshots),
+    )
+    service.get_current_assets = unexpected_current_assets
+
+    history = asyncio.run(service.get_asset_history(period))
+
+    assert len(history) == period
+    assert history[-1]["timestamp"] == today
+    assert history[0]["timestamp"] == today - (period - 1) * DAY_MS
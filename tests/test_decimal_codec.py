@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+from bson import decode, encode
+from bson.decimal128 import create_decimal128_context
+
+from app.database.base import CODEC_OPTIONS
+from app.structures.asset_structure import Asset
+
+
+def test_encode_float_derived_asset():
+    # ccxt 回傳 float, Decimal(float) 會帶出 50 位左右的二進位展開
+    asset = Asset.calculate_metrics(
+        exchange="binance",
+        symbol="ETH",
+        free=Decimal(0.25),
+        used=Decimal(0),
+        total=Decimal(0.25),
+        avg_price=Decimal(3000.1),
+        current_price=Decimal(3123.45),
+    )
+
+    data = decode(encode(asset.model_dump_for_db(), codec_options=CODEC_OPTIONS), codec_options=CODEC_OPTIONS)
+
+    assert data["current_price"] == create_decimal128_context().create_decimal(Decimal(3123.45))
+    assert isinstance(data["value_in_usdt"], Decimal)
+
+
+def test_encode_exact_decimal_unchanged():
+    data = decode(encode({"v": Decimal("0.1")}, codec_options=CODEC_OPTIONS), codec_options=CODEC_OPTIONS)
+
+    assert data["v"] == Decimal("0.1")